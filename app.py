@@ -6,16 +6,17 @@ from preprocessing import preprocess_data
 from storage import upload_to_s3
 from embedding import index_csv_file, search_index
 from config import S3_BUCKET, s3_client
-from bedrock_integration import generate_response_from_context, query_bedrock
+from bedrock_integration import generate_response_from_context, query_bedrock_hedged
 from rag_utils import (
     load_faiss_index_from_paths,
     get_context_records,
     format_prompt_for_prediction
 )
-from config import grading_scheme_map
+from config import grading_scheme_map, REQUEST_TIME_BUDGET
 from batch_prediction import extract_multi_scores
 import json
 import tempfile
+import time
 from config import S3_BUCKET, s3_client
 
 
@@ -109,6 +110,7 @@ def list_models():
 
 @app.route("/predict-individual", methods=["POST"])
 def predict_individual():
+    request_started = time.monotonic()
     try:
         data = request.get_json()
         course = data["courseName"].replace(" ", "_")
@@ -143,8 +145,8 @@ def predict_individual():
 
         # Generate prompt and call Bedrock
         prompt = format_prompt_for_prediction(normalized_input, selected_attributes, similar_records, grading_scheme, comment)
-        raw_response = query_bedrock(prompt)
-        scores = extract_multi_scores(raw_response)
+        time_left = REQUEST_TIME_BUDGET - (time.monotonic() - request_started)
+        scores = query_bedrock_hedged(prompt, extract_multi_scores, "predict-individual", time_budget=time_left)
 
         # Convert raw predicted final scores (out of 45) to percentage
         final_weight = grading_scheme.get("Final", 45)
@@ -168,6 +170,7 @@ def predict_individual():
 
 @app.route("/predict-batch", methods=["POST"])
 def predict_batch():
+    request_started = time.monotonic()
     try:
         file = request.files["file"]
         course = request.form["courseName"]
@@ -180,7 +183,7 @@ def predict_batch():
         s3_client.upload_file(temp_path, S3_BUCKET, file.filename)
 
         from batch_prediction import run_batch_prediction
-        result = run_batch_prediction(file.filename, course, threshold, email)
+        result = run_batch_prediction(file.filename, course, threshold, email, request_started)
 
         print("Batch Prediction Result (final):", result)
 
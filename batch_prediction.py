@@ -2,15 +2,17 @@ import pandas as pd
 import json
 import uuid
 import os
-from config import s3_client, S3_BUCKET
+import time
+from config import s3_client, S3_BUCKET, REQUEST_TIME_BUDGET, BATCH_REPORT_RESERVE
 from rag_utils import load_faiss_index_from_paths, get_context_records, format_prompt_for_prediction
-from bedrock_integration import query_bedrock
+from bedrock_integration import query_bedrock_hedged
 from preprocessing import preprocess_data
 from storage import upload_to_s3
 from report_utils import generate_report_df, send_report_email
 
 
-def run_batch_prediction(file_name, course_name, threshold=35, email="instructor@example.com"):
+def run_batch_prediction(file_name, course_name, threshold=35, email="instructor@example.com", request_started=None):
+    request_started = request_started or time.monotonic()
     safe_course = course_name.replace(" ", "_")
     local_csv_path = f"/tmp/{file_name}"
     preprocessed_csv_path = f"/tmp/{safe_course}_preprocessed.csv"
@@ -56,17 +58,20 @@ def run_batch_prediction(file_name, course_name, threshold=35, email="instructor
     # Load KB
     index, kb_df = load_faiss_index_from_paths(index_path, preprocessed_csv_path)
 
-    # Predict row-by-row
+    # Predict row-by-row; rows share what is left of the request budget and
+    # are marked "-" once it runs out
     predictions = []
     for _, row in normalized_df.iterrows():
         input_values = row.to_dict()
         selected_attributes = list(row.keys())
 
         try:
+            if batch_time_left(request_started) <= 0:
+                raise TimeoutError("Batch time budget exhausted")
             context = get_context_records(kb_df, index, input_values, selected_attributes, top_k=10)
             prompt = format_prompt_for_prediction(input_values, selected_attributes, context, grading_scheme)
-            prediction_response = query_bedrock(prompt)
-            scores = extract_multi_scores(prediction_response)
+            time_left = batch_time_left(request_started)
+            scores = query_bedrock_hedged(prompt, extract_multi_scores, "predict-batch", time_budget=time_left)
         except Exception as e:
             scores = {"Base": "-", "Optimistic": "-", "Pessimistic": "-"}
 
@@ -103,6 +108,10 @@ def run_batch_prediction(file_name, course_name, threshold=35, email="instructor
     }
 
 
+def batch_time_left(request_started):
+    return REQUEST_TIME_BUDGET - BATCH_REPORT_RESERVE - (time.monotonic() - request_started)
+
+
 def extract_multi_scores(response):
     import re
     pattern = {
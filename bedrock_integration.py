@@ -1,9 +1,34 @@
 import boto3
 import json
-from config import S3_BUCKET
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from botocore.config import Config
+from config import (
+    S3_BUCKET,
+    BEDROCK_CONNECT_TIMEOUT,
+    BEDROCK_READ_TIMEOUT,
+    BEDROCK_HEDGE_WORKERS,
+    BEDROCK_ENDPOINT_CONFIG
+)
+from model_router import model_router
 
 bedrock_client = boto3.client("bedrock-runtime")
 
+# Hedged calls get their own client: single botocore attempt (hedging replaces
+# retries) and a connection pool sized to the hedge executor
+hedged_bedrock_client = boto3.client(
+    "bedrock-runtime",
+    config=Config(
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        retries={"max_attempts": 1, "mode": "standard"},
+        max_pool_connections=BEDROCK_HEDGE_WORKERS
+    )
+)
+
+# Hedged calls that lose the race keep running here until their read timeout
+hedge_executor = ThreadPoolExecutor(max_workers=BEDROCK_HEDGE_WORKERS)
+
 def generate_response_from_context(query, context_rows, model_id="amazon.titan-text-express-v1"):
     context_str = "\n".join([str(row) for row in context_rows])
 
@@ -44,6 +69,29 @@ Answer:"""
 
 
 
+def invoke_titan(prompt, model_id, client=None):
+    client = client or bedrock_client
+    payload = {
+        "inputText": prompt,
+        "textGenerationConfig": {
+            "maxTokenCount": 100,
+            "temperature": 0.7,
+            "topP": 0.9
+        }
+    }
+
+    response = client.invoke_model(
+        body=json.dumps(payload),
+        modelId=model_id,
+        contentType="application/json",
+        accept="application/json"
+    )
+    raw = response["body"].read().decode("utf-8")
+    print("📨 Raw Bedrock Response:", raw)
+    data = json.loads(raw)
+    return data["results"][0]["outputText"]
+
+
 def query_bedrock(prompt, model_id="amazon.titan-text-express-v1"):
     print("\n🔍 PROMPT TO BEDROCK:\n" + prompt + "\n")  # ✅ LOG HERE
 
@@ -72,3 +120,81 @@ def query_bedrock(prompt, model_id="amazon.titan-text-express-v1"):
         return None
 
 
+def _timed_attempt(prompt, model_id, parse, client, router, deadline):
+    """
+    Runs one Bedrock call plus parse and reports the outcome to the router.
+    Transport errors (throttling, connection errors, timeouts) are not parse
+    failures and are left out of the router's stats, as are attempts that
+    finish after the deadline, whose latency may include a frozen Lambda
+    container. Returns (ok, parsed).
+    """
+    start = time.monotonic()
+    try:
+        text = invoke_titan(prompt, model_id, client)
+    except Exception as e:
+        print(f"❌ Bedrock call on {model_id} failed: {e}")
+        return False, None
+
+    try:
+        parsed = parse(text)
+        ok = True
+    except Exception as e:
+        print(f"❌ Unparseable Bedrock response from {model_id}: {e}")
+        parsed, ok = None, False
+
+    finished = time.monotonic()
+    if finished <= deadline:
+        router.record(model_id, finished - start, ok)
+    return ok, parsed
+
+
+def query_bedrock_hedged(prompt, parse, endpoint, client=None, router=None, time_budget=None):
+    """
+    Sends the prompt to the fastest model meeting the endpoint's quality floor.
+    If no valid parse arrives within the observed latency percentile (capped
+    at the endpoint's max_hedge_delay), a duplicate is sent to the next ranked
+    model and the first valid parse wins.
+    time_budget (seconds) shortens the endpoint's deadline to whatever is left
+    of the caller's request.
+    Raises ValueError when no attempt produces a valid parse before the deadline.
+    """
+    settings = BEDROCK_ENDPOINT_CONFIG[endpoint]
+    client = client or hedged_bedrock_client
+    router = router or model_router
+    print("\n🔍 PROMPT TO BEDROCK:\n" + prompt + "\n")
+
+    ranked = router.rank_models(settings["models"], settings["quality_floor"], settings.get("explore_share", 0.0))
+    max_attempts = settings["max_attempts"]
+    timeout = settings["timeout"] if time_budget is None else min(settings["timeout"], time_budget)
+    deadline = time.monotonic() + timeout
+    pending = set()
+    attempts = 0
+    hedge_at = time.monotonic()
+
+    while True:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+
+        if attempts < max_attempts and (now >= hedge_at or not pending):
+            model_id = ranked[attempts % len(ranked)]
+            if attempts:
+                print(f"⏱️ Hedging Bedrock call on {model_id} (attempt {attempts + 1})")
+            pending.add(hedge_executor.submit(_timed_attempt, prompt, model_id, parse, client, router, deadline))
+            attempts += 1
+            delay = router.latency_percentile(model_id, settings["hedge_percentile"])
+            if delay is None:
+                delay = settings["hedge_delay"]
+            hedge_at = now + min(delay, settings["max_hedge_delay"])
+
+        if not pending:
+            break
+
+        wake_at = min(hedge_at, deadline) if attempts < max_attempts else deadline
+        done, pending = wait(pending, timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            ok, parsed = future.result()
+            if ok:
+                return parsed
+
+    raise ValueError(f"No valid Bedrock response for {endpoint} after {attempts} attempt(s)")
@@ -4,4 +4,50 @@ import boto3
 S3_BUCKET = "early-intervention-data"
 s3_client = boto3.client("s3")
 # Global map to hold grading schemes for each course
-grading_scheme_map = {}
\ No newline at end of file
+grading_scheme_map = {}
+
+# Hedged Bedrock client settings. Retries are left to hedging, so botocore
+# makes a single attempt per call. read_timeout bounds each socket read, not
+# the whole call, so an abandoned attempt can outlive its endpoint deadline
+# by up to connect + read timeout; such attempts are not recorded as samples.
+BEDROCK_CONNECT_TIMEOUT = 3
+BEDROCK_READ_TIMEOUT = 12
+BEDROCK_HEDGE_WORKERS = 16
+
+# API Gateway cuts requests off at 29s; leave headroom for the response
+REQUEST_TIME_BUDGET = 27
+
+# Part of the batch request budget kept for uploading and emailing the report
+BATCH_REPORT_RESERVE = 5
+
+# Per-endpoint Bedrock routing and hedging settings.
+#   models: candidate Titan text model IDs, in order of preference
+#   quality_floor: minimum parse success rate for a model to be routed to first
+#   hedge_percentile: observed latency percentile after which a duplicate is sent
+#   hedge_delay: fallback hedge delay until enough latencies are observed
+#   max_hedge_delay: upper bound on the hedge delay, whatever the percentile
+#   max_attempts: total calls (original + hedges) per prediction
+#   timeout: overall deadline for a prediction
+#   explore_share: fraction of calls led by the least-sampled model instead
+BEDROCK_ENDPOINT_CONFIG = {
+    "predict-individual": {
+        "models": ["amazon.titan-text-express-v1", "amazon.titan-text-lite-v1"],
+        "quality_floor": 0.9,
+        "hedge_percentile": 95,
+        "hedge_delay": 2.0,
+        "max_hedge_delay": 3.0,
+        "max_attempts": 2,
+        "timeout": 12,
+        "explore_share": 0.1,
+    },
+    "predict-batch": {
+        "models": ["amazon.titan-text-express-v1", "amazon.titan-text-lite-v1"],
+        "quality_floor": 0.9,
+        "hedge_percentile": 90,
+        "hedge_delay": 1.5,
+        "max_hedge_delay": 2.0,
+        "max_attempts": 2,
+        "timeout": 12,
+        "explore_share": 0.1,
+    },
+}
@@ -0,0 +1,88 @@
+import random
+import threading
+from collections import deque
+
+
+class LatencyRouter:
+    """
+    Tracks observed latency and parse-failure rate per Bedrock model ID and
+    picks the fastest model whose parse success rate meets a quality floor.
+    """
+
+    def __init__(self, window=200, min_samples=5, rng=None):
+        self.window = window
+        self.min_samples = min_samples
+        self.rng = rng or random.Random()
+        self._latencies = {}
+        self._outcomes = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_id, latency, parsed_ok):
+        """
+        Records a call that returned text. Every outcome counts towards the
+        parse success rate; only parsed responses count towards latency.
+        """
+        with self._lock:
+            self._outcomes.setdefault(model_id, deque(maxlen=self.window)).append(bool(parsed_ok))
+            if parsed_ok:
+                self._latencies.setdefault(model_id, deque(maxlen=self.window)).append(latency)
+
+    def sample_count(self, model_id):
+        with self._lock:
+            return len(self._outcomes.get(model_id, ()))
+
+    def success_rate(self, model_id):
+        with self._lock:
+            outcomes = self._outcomes.get(model_id)
+            if not outcomes:
+                return None
+            return sum(outcomes) / len(outcomes)
+
+    def latency_percentile(self, model_id, percentile):
+        """
+        Nearest-rank percentile of the latencies of parsed responses, or None
+        when the model has fewer than min_samples of them.
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(model_id, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(int(round(percentile / 100 * len(samples))) - 1, 0)
+        return samples[min(rank, len(samples) - 1)]
+
+    def rank_models(self, model_ids, quality_floor, explore_share=0.0):
+        """
+        Orders candidate model IDs for a request. Models with enough samples
+        that meet the quality floor come first, fastest median latency first.
+        Models without enough samples keep their configured order after them,
+        and models below the floor go last so they are only used as a fallback.
+
+        With probability explore_share the least-sampled model that is not
+        below the floor is moved to the front, so unmeasured models reach
+        min_samples. Below-floor models never lead a request; they are only
+        re-measured when they come up as a hedge.
+        """
+        measured, unmeasured, below_floor = [], [], []
+        for position, model_id in enumerate(model_ids):
+            success_rate = self.success_rate(model_id)
+            median = self.latency_percentile(model_id, 50)
+            if self.sample_count(model_id) >= self.min_samples and success_rate < quality_floor:
+                below_floor.append((success_rate, position, model_id))
+            elif median is None:
+                unmeasured.append(model_id)
+            else:
+                measured.append((median, position, model_id))
+
+        measured.sort()
+        below_floor.sort(key=lambda item: (-item[0], item[1]))
+        ranked = [model_id for _, _, model_id in measured] + unmeasured
+
+        if len(ranked) > 1 and self.rng.random() < explore_share:
+            explore = min(ranked[1:], key=self.sample_count)
+            ranked.remove(explore)
+            ranked.insert(0, explore)
+        return ranked + [model_id for _, _, model_id in below_floor]
+
+
+# Shared across requests within a warm Lambda container
+model_router = LatencyRouter()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules live at the repo root rather than in a package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# boto3 clients are created at import time and need a region
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
@@ -0,0 +1,40 @@
+import io
+import json
+import time
+
+
+class FakeBedrockClient:
+    """
+    Stands in for the bedrock-runtime client. Each invoke_model call sleeps for
+    latencies[model_id]() seconds, then raises for models in errors or returns
+    outputs[model_id] as Titan output.
+    """
+
+    def __init__(self, latencies, outputs, errors=()):
+        self.latencies = latencies
+        self.outputs = outputs
+        self.errors = set(errors)
+        self.calls = []
+
+    def invoke_model(self, body, modelId, contentType, accept):
+        self.calls.append((modelId, time.monotonic()))
+        time.sleep(self.latencies[modelId]())
+        if modelId in self.errors:
+            raise ConnectionError(f"Injected transport error for {modelId}")
+        raw = json.dumps({"results": [{"outputText": self.outputs[modelId]}]})
+        return {"body": io.BytesIO(raw.encode("utf-8"))}
+
+
+def constant(seconds):
+    return lambda: seconds
+
+
+def heavy_tail(rng, fast, slow, tail_share):
+    """
+    Latency mixture: usually around `fast`, but `tail_share` of calls take
+    around `slow`. Pass a seeded random.Random so runs are repeatable.
+    """
+    def sample():
+        base = slow if rng.random() < tail_share else fast
+        return base * rng.uniform(0.8, 1.2)
+    return sample
@@ -0,0 +1,181 @@
+import random
+import time
+
+import pytest
+
+import bedrock_integration
+from bedrock_integration import query_bedrock_hedged
+from model_router import LatencyRouter
+from fake_bedrock import FakeBedrockClient, constant, heavy_tail
+
+VALID = "Base: 30"
+
+
+def parse(text):
+    if not text.startswith("Base:"):
+        raise ValueError(f"Unparseable response: {text}")
+    return text
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    settings = {
+        "models": ["primary", "secondary"],
+        "quality_floor": 0.9,
+        "hedge_percentile": 90,
+        "hedge_delay": 5.0,
+        "max_hedge_delay": 5.0,
+        "max_attempts": 2,
+        "timeout": 3.0,
+    }
+    monkeypatch.setitem(bedrock_integration.BEDROCK_ENDPOINT_CONFIG, "test", settings)
+    return settings
+
+
+def test_slow_primary_is_hedged_at_observed_percentile(endpoint):
+    router = LatencyRouter(min_samples=5)
+    for _ in range(5):
+        router.record("primary", 0.05, True)
+        router.record("secondary", 0.2, True)
+    client = FakeBedrockClient(
+        latencies={"primary": constant(1.0), "secondary": constant(0.01)},
+        outputs={"primary": "Base: 10", "secondary": "Base: 20"},
+    )
+
+    started = time.monotonic()
+    result = query_bedrock_hedged("prompt", parse, "test", client=client, router=router)
+    elapsed = time.monotonic() - started
+
+    assert result == "Base: 20"
+    assert [model_id for model_id, _ in client.calls] == ["primary", "secondary"]
+    hedge_gap = client.calls[1][1] - client.calls[0][1]
+    assert 0.04 <= hedge_gap < 0.5
+    assert elapsed < 0.5
+
+
+def test_fast_failure_sends_next_attempt_immediately(endpoint):
+    client = FakeBedrockClient(
+        latencies={"primary": constant(0.0), "secondary": constant(0.01)},
+        outputs={"primary": "I cannot predict that.", "secondary": VALID},
+    )
+
+    started = time.monotonic()
+    result = query_bedrock_hedged("prompt", parse, "test", client=client, router=LatencyRouter())
+
+    assert result == VALID
+    # hedge_delay is 5s, so this only passes if the failure triggered the retry
+    assert time.monotonic() - started < 1.0
+
+
+def test_deadline_is_enforced(endpoint):
+    endpoint["timeout"] = 0.3
+    client = FakeBedrockClient(
+        latencies={"primary": constant(2.0), "secondary": constant(2.0)},
+        outputs={"primary": VALID, "secondary": VALID},
+    )
+
+    started = time.monotonic()
+    with pytest.raises(ValueError):
+        query_bedrock_hedged("prompt", parse, "test", client=client, router=LatencyRouter())
+
+    assert time.monotonic() - started < 1.0
+
+
+def test_time_budget_shortens_deadline(endpoint):
+    client = FakeBedrockClient(
+        latencies={"primary": constant(2.0), "secondary": constant(2.0)},
+        outputs={"primary": VALID, "secondary": VALID},
+    )
+
+    started = time.monotonic()
+    with pytest.raises(ValueError):
+        query_bedrock_hedged("prompt", parse, "test", client=client, router=LatencyRouter(), time_budget=0.2)
+
+    assert time.monotonic() - started < 1.0
+
+
+def test_all_attempts_failing_raises(endpoint):
+    client = FakeBedrockClient(
+        latencies={"primary": constant(0.0), "secondary": constant(0.0)},
+        outputs={"primary": "nope", "secondary": "nope"},
+    )
+    router = LatencyRouter(min_samples=1)
+
+    with pytest.raises(ValueError):
+        query_bedrock_hedged("prompt", parse, "test", client=client, router=router)
+
+    assert len(client.calls) == 2
+    assert router.success_rate("primary") == 0.0
+    assert router.success_rate("secondary") == 0.0
+
+
+def test_hedge_delay_is_capped_when_percentile_reaches_deadline(endpoint):
+    endpoint.update({"timeout": 1.2, "hedge_percentile": 95, "max_hedge_delay": 0.2})
+    router = LatencyRouter(min_samples=5)
+    for _ in range(18):
+        router.record("primary", 0.05, True)
+    for _ in range(2):
+        router.record("primary", 1.2, True)
+    client = FakeBedrockClient(
+        latencies={"primary": constant(2.0), "secondary": constant(0.01)},
+        outputs={"primary": VALID, "secondary": "Base: 20"},
+    )
+
+    started = time.monotonic()
+    result = query_bedrock_hedged("prompt", parse, "test", client=client, router=router)
+
+    assert result == "Base: 20"
+    assert time.monotonic() - started < 0.5
+
+
+def test_transport_errors_do_not_count_as_parse_failures(endpoint):
+    client = FakeBedrockClient(
+        latencies={"primary": constant(0.0), "secondary": constant(0.0)},
+        outputs={"primary": VALID, "secondary": VALID},
+        errors={"primary"},
+    )
+    router = LatencyRouter(min_samples=1)
+
+    assert query_bedrock_hedged("prompt", parse, "test", client=client, router=router) == VALID
+    assert router.sample_count("primary") == 0
+    assert router.success_rate("secondary") == 1.0
+
+
+def test_attempts_finishing_after_deadline_are_not_recorded(endpoint):
+    endpoint["timeout"] = 0.1
+    client = FakeBedrockClient(
+        latencies={"primary": constant(0.3), "secondary": constant(0.3)},
+        outputs={"primary": VALID, "secondary": VALID},
+    )
+    router = LatencyRouter(min_samples=1)
+
+    with pytest.raises(ValueError):
+        query_bedrock_hedged("prompt", parse, "test", client=client, router=router)
+    time.sleep(0.4)
+
+    assert router.sample_count("primary") == 0
+
+
+def test_hedging_cuts_tail_latency_of_heavy_tailed_model(endpoint):
+    endpoint.update({"hedge_percentile": 90, "hedge_delay": 0.05, "max_hedge_delay": 0.1, "timeout": 2.0})
+
+    def p95_latency(max_attempts):
+        endpoint["max_attempts"] = max_attempts
+        rng = random.Random(7)
+        client = FakeBedrockClient(
+            latencies={"primary": heavy_tail(rng, 0.01, 0.6, 0.2), "secondary": constant(0.03)},
+            outputs={"primary": VALID, "secondary": VALID},
+        )
+        router = LatencyRouter(min_samples=5)
+        latencies = []
+        for _ in range(40):
+            started = time.monotonic()
+            query_bedrock_hedged("prompt", parse, "test", client=client, router=router)
+            latencies.append(time.monotonic() - started)
+        return sorted(latencies)[int(0.95 * len(latencies)) - 1]
+
+    unhedged = p95_latency(max_attempts=1)
+    hedged = p95_latency(max_attempts=2)
+
+    assert unhedged > 0.4
+    assert hedged < 0.25
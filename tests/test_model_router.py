@@ -0,0 +1,76 @@
+from model_router import LatencyRouter
+
+
+class FixedRandom:
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+def seed(router, model_id, latency, parsed_ok=True, count=5):
+    for _ in range(count):
+        router.record(model_id, latency, parsed_ok)
+
+
+def test_latency_percentile_needs_min_samples():
+    router = LatencyRouter(min_samples=3)
+    seed(router, "a", 1.0, count=2)
+    assert router.latency_percentile("a", 50) is None
+    assert router.latency_percentile("missing", 50) is None
+
+    router.record("a", 3.0, True)
+    assert router.latency_percentile("a", 50) == 1.0
+    assert router.latency_percentile("a", 95) == 3.0
+
+
+def test_rank_models_orders_measured_then_unmeasured_then_below_floor():
+    router = LatencyRouter(min_samples=2)
+    seed(router, "slow", 2.0)
+    seed(router, "fast", 0.5)
+    seed(router, "broken", 0.1, parsed_ok=False)
+
+    ranked = router.rank_models(["broken", "unmeasured", "slow", "fast"], quality_floor=0.9)
+
+    assert ranked == ["fast", "slow", "unmeasured", "broken"]
+
+
+def test_rank_models_explores_least_sampled_model():
+    router = LatencyRouter(min_samples=2, rng=FixedRandom(0.0))
+    seed(router, "primary", 0.5, count=10)
+    seed(router, "alternate", 1.0, count=3)
+
+    ranked = router.rank_models(["primary", "alternate", "new"], quality_floor=0.9, explore_share=0.1)
+
+    assert ranked == ["new", "primary", "alternate"]
+    assert router.sample_count("new") == 0
+
+
+def test_rank_models_skips_exploration_outside_share():
+    router = LatencyRouter(min_samples=2, rng=FixedRandom(0.5))
+    seed(router, "primary", 0.5)
+
+    ranked = router.rank_models(["primary", "new"], quality_floor=0.9, explore_share=0.1)
+
+    assert ranked == ["primary", "new"]
+
+
+def test_rank_models_never_explores_below_floor_model():
+    router = LatencyRouter(min_samples=2, rng=FixedRandom(0.0))
+    seed(router, "primary", 0.5, count=10)
+    seed(router, "alternate", 1.0, count=10)
+    seed(router, "broken", 0.1, parsed_ok=False, count=2)
+
+    ranked = router.rank_models(["primary", "alternate", "broken"], quality_floor=0.9, explore_share=1.0)
+
+    assert ranked == ["alternate", "primary", "broken"]
+
+
+def test_latency_ignores_unparsed_responses():
+    router = LatencyRouter(min_samples=2)
+    seed(router, "a", 0.1, count=2)
+    seed(router, "a", 5.0, parsed_ok=False, count=2)
+
+    assert router.latency_percentile("a", 100) == 0.1
+    assert router.success_rate("a") == 0.5